@@ -1,14 +1,21 @@
-import time
-import random
 import numpy as np
-import tensorflow as tf
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense
 import tkinter as tk
-from dataclasses import dataclass
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
 import logging
-import threading
+import heapq
+from operator import itemgetter
+
+if TYPE_CHECKING:
+    import tensorflow as tf
+
+# TensorFlow is imported lazily: it is only needed to train (and optionally
+# quantize) the MLP, never on the per-tick inference path.
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
 
 AIR_DENSITY = 1.225           # kg/m^3 (not heavily used in this simplified example)
 WING_AREA = 174               # ft^2 (placeholder for lift calculation)
@@ -20,27 +27,204 @@ MAX_RANGE = 1185              # km
 FUEL_CAPACITY = 56            # gallons
 FUEL_BURN_RATE = 8.4          # gallons/hour (derived from range)
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+RAND_BUFFER_SIZE = 8192       # pre-generated uniform draws per refill
+STEP_DRAWS = 7                # uniform draws per aircraft per _step
+TICK_INTERVAL_MS = 500        # simulation step period (ms)
+STATUS_REFRESH_TICKS = 2      # refresh the status panel every N GUI updates
+NN_REFRESH_TICKS = 3          # rerun the MLP every N evaluations, reuse in between
+CRITICAL_ALERT = (1.0, "CRITICAL: Immediate action required!")
+WEATHER_NAMES = ("Clear", "Turbulent", "Storm")
+STATUS_TEMPLATE = (
+    "ALT: {:.0f} ft | SPD: {:.1f} kt\n"
+    "FUEL: {:.1f} gal | VS: {:.0f} fpm\n"
+    "RPM: {:.0f} | WIND: {:.1f} kt\n"
+    "WEATHER: {}\n"
+    "WEIGHT: {:.0f} lbs | CG: {:.1f} in\n"
+    "REMAINING: {:.0f} km to Tokyo"
+)
 
 logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
 
+# Index layout of the packed state vector used by _step and FlightState.
+# The first ten entries are the MLP features, in model input order.
+(ALT, SPD, FUEL, VS, WX, RPM, WIND, WEIGHT, CG, DIST, HDG) = range(11)
+# Full-scale value of each MLP feature; the int8 model takes inputs divided by
+# these so a single input quantization scale resolves every feature
+INT8_FEATURE_SCALE = np.array(
+    [14000, 150, 56, 1000, 2, 2700, 30, 2550, 50, 1147], dtype=np.float32
+)
+STATE_FIELDS = (
+    "altitude", "airspeed", "fuel", "heading", "vertical_speed",
+    "weather_severity", "engine_rpm", "wind_speed", "total_weight",
+    "cg_position", "distance_remaining"
+)
+
+
+@njit(cache=True, fastmath=True)
+def _step(s, r, weight_factor, max_climb_rate, stall_speed, max_speed,
+          max_fuel, max_altitude, max_rpm):
+    """
+    One physics tick for N aircraft on an (11, N) state array (rows in the
+    index layout above; N=1 for the GUI flight): flight physics and simulated
+    ADS-B data changes, with each parameter clamped to 'safe' or plausible
+    bounds as soon as its final value is known.
+    r holds (STEP_DRAWS, N) uniform [0, 1) draws. Updates s in place and returns it.
+    """
+    for j in range(s.shape[1]):
+        airspeed = s[SPD, j]
+        weight = s[WEIGHT, j]
+
+        # Convert from knots to ft/s
+        speed_fts = airspeed * 1.68781
+        # Calculate naive lift
+        lift = 0.5 * AIR_DENSITY * (speed_fts**2) * WING_AREA * LIFT_COEFFICIENT * 0.0689476
+        excess_lift = lift - weight
+
+        # RPM factor: if engine_rpm is high, produce more climb
+        rpm_factor = (s[RPM, j] - 2400) / 2400
+
+        # vertical_speed in ft/min
+        vs = (
+            excess_lift / weight * 1000
+            + rpm_factor * 500
+            - (50 + 50 * r[0, j])
+        ) * weight_factor
+
+        # Update altitude in feet (from the unclamped vertical speed)
+        alt = s[ALT, j] + vs / 60
+        s[ALT, j] = 0.0 if alt < 0 else (max_altitude if alt > max_altitude else alt)
+        s[VS, j] = -max_climb_rate if vs < -max_climb_rate else (max_climb_rate if vs > max_climb_rate else vs)
+
+        # Wind effect on airspeed & heading
+        wind_effect = s[WIND, j] * (-0.1 + 0.2 * r[1, j])
+        airspeed += wind_effect
+        s[HDG, j] = (s[HDG, j] + wind_effect * 0.5) % 360
+
+        # Fuel consumption
+        # We'll assume a short step, so we approximate usage:
+        fuel = s[FUEL, j] - FUEL_BURN_RATE * 0.00833 * weight_factor
+        s[FUEL, j] = 0.0 if fuel < 0 else (max_fuel if fuel > max_fuel else fuel)
+
+        # Distance covered (1 knot = 1.852 km/h)
+        dist = s[DIST, j] - airspeed * 1.852 * 0.00833
+        s[DIST, j] = 0.0 if dist < 0 else dist
+
+        # Simulated "ADS-B" data: slight randomization of airspeed & engine RPM
+        airspeed += -3 + 6 * r[2, j]
+        s[SPD, j] = stall_speed if airspeed < stall_speed else (max_speed if airspeed > max_speed else airspeed)
+        rpm = s[RPM, j] - 50 + 100 * r[3, j]
+        s[RPM, j] = 1000.0 if rpm < 1000 else (max_rpm if rpm > max_rpm else rpm)
+
+        # If weather is severe, create wind events
+        s[WIND, j] = 30 * r[4, j] if s[WX, j] > 0 else 0.0
+
+        # Occasionally change weather severity
+        if r[5, j] < 0.15:
+            s[WX, j] = int(r[6, j] * 3)
+    return s
+
+
+class _StateField:
+    """Attribute view onto one slot of FlightState's backing array."""
+    __slots__ = ("index", "cast")
+
+    def __init__(self, index: int, cast=float):
+        self.index = index
+        self.cast = cast
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return self.cast(obj._a[self.index])
+
+    def __set__(self, obj, value) -> None:
+        obj._a[self.index] = value
+
 
-@dataclass
 class FlightState:
     """
     Stores flight parameters for the Seoul-Tokyo route.
     All values are rough placeholders for demonstration.
+    Backed by a single float64 array in the _step index layout. Hot paths
+    (the physics kernel, MLP features, rule table, status panel) read that
+    array directly; the named attributes are convenience views and are
+    slower than plain attribute access.
+    """
+    __slots__ = ("_a",)
+
+    altitude = _StateField(ALT)             # feet
+    airspeed = _StateField(SPD)             # knots
+    fuel = _StateField(FUEL)                # gallons
+    heading = _StateField(HDG)              # degrees (0-359)
+    vertical_speed = _StateField(VS)        # feet/min
+    weather_severity = _StateField(WX, int)  # 0=clear, 1=turbulent, 2=storm
+    engine_rpm = _StateField(RPM)           # rpm
+    wind_speed = _StateField(WIND)          # knots
+    total_weight = _StateField(WEIGHT)      # lbs
+    cg_position = _StateField(CG)           # inches aft of datum
+    distance_remaining = _StateField(DIST)  # km to destination
+
+    def __init__(self, altitude: float, airspeed: float, fuel: float, heading: float,
+                 vertical_speed: float, weather_severity: int, engine_rpm: float,
+                 wind_speed: float, total_weight: float, cg_position: float,
+                 distance_remaining: float):
+        self._a = np.empty(11, dtype=np.float64)
+        self._a[:] = (altitude, airspeed, fuel, vertical_speed, weather_severity,
+                      engine_rpm, wind_speed, total_weight, cg_position,
+                      distance_remaining, heading)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FlightState):
+            return NotImplemented
+        return bool(np.array_equal(self._a, other._a))
+
+    __hash__ = None  # mutable, like the dataclass it replaced
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in STATE_FIELDS)
+        return f"FlightState({fields})"
+
+
+class _BatchField(_StateField):
+    """Row view onto one field of BatchedFlightState's (11, N) array."""
+    __slots__ = ()
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj._a[self.index]
+
+
+class BatchedFlightState:
+    """
+    Counterpart of FlightState for N parallel aircraft, backed by one
+    (11, N) float64 array in the _step index layout. Each field reads as an
+    (N,) row view (weather_severity included, as float).
     """
-    altitude: float         # feet
-    airspeed: float         # knots
-    fuel: float             # gallons
-    heading: float          # degrees (0-359)
-    vertical_speed: float   # feet/min
-    weather_severity: int   # 0=clear, 1=turbulent, 2=storm
-    engine_rpm: float       # rpm
-    wind_speed: float       # knots
-    total_weight: float     # lbs
-    cg_position: float      # inches aft of datum
-    distance_remaining: float  # km to destination
+    __slots__ = ("_a",)
+
+    altitude = _BatchField(ALT)
+    airspeed = _BatchField(SPD)
+    fuel = _BatchField(FUEL)
+    heading = _BatchField(HDG)
+    vertical_speed = _BatchField(VS)
+    weather_severity = _BatchField(WX)
+    engine_rpm = _BatchField(RPM)
+    wind_speed = _BatchField(WIND)
+    total_weight = _BatchField(WEIGHT)
+    cg_position = _BatchField(CG)
+    distance_remaining = _BatchField(DIST)
+
+    def __init__(self, a: np.ndarray):
+        self._a = np.ascontiguousarray(a, dtype=np.float64)
+
+    @classmethod
+    def from_states(cls, states: List[FlightState]) -> "BatchedFlightState":
+        """Stack scalar FlightStates into one batch."""
+        return cls(np.stack([st._a for st in states], axis=1))
+
+    def __len__(self) -> int:
+        return self._a.shape[1]
 
 class AIDecisionSupport:
     """
@@ -50,8 +234,19 @@ class AIDecisionSupport:
     - Displays real-time recommendations via Tkinter.
     """
 
-    def __init__(self, pilot_weight: float, cargo_weight: float):
-        """Initialize plane specs, flight state, neural net, and GUI."""
+    def __init__(self, pilot_weight: float, cargo_weight: float,
+                 quantization: Optional[str] = None, seed: Optional[int] = None):
+        """
+        Initialize plane specs, flight state, neural net, and GUI.
+        quantization: None runs the FP32 NumPy forward pass; "int8" runs a
+        full-integer quantized TFLite model; "float16" runs an FP16 TFLite
+        model on the GPU delegate when one is available.
+        seed: optional seed for the simulation's random number generator.
+        """
+        if quantization not in (None, "int8", "float16"):
+            raise ValueError(f"Unsupported quantization: {quantization!r}")
+        self.quantization = quantization
+
         # Basic aircraft specs (simplified)
         self.base_weight = 1670         # lbs (empty weight, placeholder)
         self.total_weight = self.base_weight + pilot_weight + cargo_weight
@@ -88,8 +283,29 @@ class AIDecisionSupport:
             distance_remaining=DISTANCE_SEOUL_TOKYO
         )
 
-        # Train minimal neural net
-        self.model = self._train_neural_network()
+        # Pre-generated uniform draws, consumed in slices by each tick
+        self._rng = np.random.default_rng(seed)
+        self._rbuf = self._rng.random(RAND_BUFFER_SIZE)
+        self._ri = 0
+
+        # Train minimal neural net; inference runs in pure NumPy on its
+        # exported float32 (kernel, bias) weights
+        weights, tflite_model = self._train_neural_network()
+        (self._W1, self._b1, self._W2, self._b2, self._W3, self._b3) = weights
+
+        # Reusable (1, 10) MLP input row, in the model's float32 dtype
+        self._feat = np.empty((1, 10), dtype=np.float32)
+        # Criticality is cached across NN_REFRESH_TICKS evaluations
+        self._nn_tick = 0
+        self._cached_crit = 0.0
+
+        # Optional quantized TFLite path (converted in _train_neural_network);
+        # the float32 NumPy weights above remain the fallback
+        self._interpreter = None
+        if tflite_model is not None:
+            self._interpreter = self._build_tflite_interpreter(tflite_model)
+            self._input_details = self._interpreter.get_input_details()[0]
+            self._output_details = self._interpreter.get_output_details()[0]
 
         # Weighted rule-based approach for recommendations
         self.weights = {
@@ -97,23 +313,37 @@ class AIDecisionSupport:
             "weather": 0.6,     "stability": 0.5, "engine": 0.4,
             "weight": 0.3,      "cg": 0.2,        "distance": 0.1
         }
+        self._build_rule_table()
         self.stable_count = 0  # track stable flight periods
 
         # Set up Tkinter GUI
         self.root = tk.Tk()
         self.root.title("AI Decision Support - Seoul to Tokyo")
-        self.status_label = tk.Label(self.root, text="", font=("Arial", 12))
+        self._status_var = tk.StringVar(self.root, value="")
+        self._recommend_var = tk.StringVar(self.root, value="AI Recommendations:\n")
+        self.status_label = tk.Label(self.root, textvariable=self._status_var,
+                                     font=("Arial", 12))
         self.status_label.pack(pady=10)
-        self.recommend_label = tk.Label(self.root, text="AI Recommendations:\n",
+        self.recommend_label = tk.Label(self.root, textvariable=self._recommend_var,
                                         font=("Arial", 10), justify="left")
         self.recommend_label.pack(pady=10)
+        self._gui_tick = 0  # counts update_gui calls for status throttling
+        self._fmt = STATUS_TEMPLATE.format
+        self._weather_names = WEATHER_NAMES
         self.running = True  # control simulation loop
 
-    def _train_neural_network(self) -> Sequential:
+    def _train_neural_network(self) -> Tuple[List[np.ndarray], Optional[bytes]]:
         """
         Train a minimal neural network (binary output: 0=non-critical, 1=critical).
         Using only a few lines of data to illustrate concept.
+        Returns the layer weights as float32 arrays plus the quantized TFLite
+        model (None unless quantization was requested), then releases the
+        Keras model.
         """
+        import tensorflow as tf
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import Dense
+
         X = np.array([
             [5000, 124, 40,   0, 0, 2400,  0, 1670, 37, 1147],   # Start
             [800,   50,  5, -500, 2, 2200, 20, 2550, 45,  500],   # Critical
@@ -130,189 +360,297 @@ class AIDecisionSupport:
         model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
         model.fit(X, y, epochs=50, verbose=0)
         logging.info("Neural network trained with minimal flight data.")
-        return model
 
-    def simulate_adsb_data(self) -> None:
+        tflite_model = None
+        if self.quantization is not None:
+            tflite_model = self._quantize_model(model, X)
+
+        weights = [w.astype(np.float32) for w in model.get_weights()]
+        del model
+        tf.keras.backend.clear_session()
+        return weights, tflite_model
+
+    def _quantize_model(self, model: "tf.keras.Model", X: np.ndarray) -> bytes:
         """
-        Simulate real-time data changes (wind speed, weather severity).
-        For demonstration, randomize wind speed if weather is non-clear.
+        Post-training quantization of the MLP to a TFLite model.
+        - "int8": full-integer, calibrated on the training rows plus jittered
+          copies of them (on x86 these kernels may not beat the FP32 path).
+          Inputs are divided by INT8_FEATURE_SCALE, with the inverse scaling
+          folded into the first layer, so small-range features such as
+          weather or CG don't collapse into one or two int8 buckets.
+        - "float16": FP16 weights, intended for the GPU delegate.
         """
-        # Slight randomization of airspeed & engine RPM
-        self.state.airspeed += random.uniform(-3, 3)
-        self.state.engine_rpm += random.uniform(-50, 50)
-
-        # If weather is severe, create wind events
-        if self.state.weather_severity > 0:
-            self.state.wind_speed = random.uniform(0, 30)
+        import tensorflow as tf
+
+        if self.quantization == "int8":
+            rng = np.random.default_rng(0)
+            X_augmented = np.concatenate(
+                [X] + [X * rng.uniform(0.9, 1.1, size=X.shape) for _ in range(25)]
+            ).astype(np.float32)
+            X_scaled = X_augmented / INT8_FEATURE_SCALE
+
+            scaled_model = tf.keras.models.clone_model(model)
+            W1, b1, *rest = model.get_weights()
+            scaled_model.set_weights([W1 * INT8_FEATURE_SCALE[:, None], b1, *rest])
+
+            converter = tf.lite.TFLiteConverter.from_keras_model(scaled_model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.representative_dataset = lambda: ([np.array([row], np.float32)] for row in X_scaled)
+            converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+            converter.inference_input_type = tf.int8
+            converter.inference_output_type = tf.int8
         else:
-            self.state.wind_speed = 0
-
-        # Occasionally change weather severity
-        if random.random() < 0.15:
-            self.state.weather_severity = random.randint(0, 2)
+            converter = tf.lite.TFLiteConverter.from_keras_model(model)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            converter.target_spec.supported_types = [tf.float16]
+        tflite_model = converter.convert()
+        logging.info(f"Neural network quantized to {self.quantization} TFLite ({len(tflite_model)} bytes).")
+
+        if self.quantization == "int8":
+            # Report how closely the int8 model tracks FP32 on the calibration set
+            interpreter = tf.lite.Interpreter(model_content=tflite_model)
+            interpreter.allocate_tensors()
+            in_details = interpreter.get_input_details()[0]
+            out_details = interpreter.get_output_details()[0]
+            int8_out = np.array([
+                self._run_tflite(interpreter, in_details, out_details, row[None, :])
+                for row in X_augmented
+            ])
+            fp32_out = model.predict(X_augmented, verbose=0)[:, 0]
+            agreement = np.mean((int8_out > 0.8) == (fp32_out > 0.8))
+            logging.info(
+                f"INT8 vs FP32 on {len(X_augmented)} calibration rows: "
+                f"max |diff| {np.max(np.abs(int8_out - fp32_out)):.3f}, "
+                f"{agreement:.0%} agree on the critical threshold."
+            )
+        return tflite_model
+
+    def _build_tflite_interpreter(self, tflite_model: bytes) -> "tf.lite.Interpreter":
+        """
+        Load the quantized model, attaching the GPU delegate for FP16.
+        Falls back to the CPU kernels if the delegate cannot be loaded.
+        """
+        import tensorflow as tf
+
+        delegates = []
+        if self.quantization == "float16":
+            try:
+                delegates.append(tf.lite.experimental.load_delegate("libdelegate_gpu.so"))
+            except (ValueError, OSError) as err:
+                logging.warning(f"GPU delegate unavailable, using CPU kernels: {err}")
+        interpreter = tf.lite.Interpreter(model_content=tflite_model,
+                                          experimental_delegates=delegates or None)
+        interpreter.allocate_tensors()
+        return interpreter
+
+    def _tflite_invoke(self, x: np.ndarray) -> float:
+        """Run the loaded TFLite model on a (1, 10) float32 feature row."""
+        return self._run_tflite(self._interpreter, self._input_details,
+                                self._output_details, x)
+
+    @staticmethod
+    def _run_tflite(interpreter: "tf.lite.Interpreter", input_details: dict,
+                    output_details: dict, x: np.ndarray) -> float:
+        """
+        Invoke a TFLite interpreter on a (1, 10) float32 feature row. For an
+        int8 model the input is normalised and quantized, and the output
+        dequantized.
+        """
+        quantized = input_details["dtype"] == np.int8
+        if quantized:
+            in_scale, in_zero = input_details["quantization"]
+            x = x / INT8_FEATURE_SCALE
+            x = np.clip(np.round(x / in_scale + in_zero), -128, 127).astype(np.int8)
+        interpreter.set_tensor(input_details["index"], x)
+        interpreter.invoke()
+        out = interpreter.get_tensor(output_details["index"])[0, 0]
+        if quantized:
+            out_scale, out_zero = output_details["quantization"]
+            return (float(out) - out_zero) * out_scale
+        return float(out)
+
+    def _nn_forward(self, x: np.ndarray) -> float:
+        """
+        Forward pass of the 10-16-8-1 MLP using the exported float32 weights.
+        Avoids TensorFlow dispatch entirely for a few hundred multiply-adds.
+        """
+        h = np.maximum(0, np.dot(x, self._W1) + self._b1)
+        h = np.maximum(0, np.dot(h, self._W2) + self._b2)
+        z = np.dot(h, self._W3) + self._b3
+        # Sigmoid as exp(-log(1 + e^-z)): stable for the large |z| that the
+        # unscaled features produce
+        return np.exp(-np.logaddexp(0, -z))[0, 0]
+
+    def _draws(self, n: int) -> np.ndarray:
+        """
+        Return the next n uniform [0, 1) draws from the pre-generated buffer,
+        refilling it when exhausted. Requests larger than the buffer are
+        drawn directly from the generator.
+        """
+        if n > RAND_BUFFER_SIZE:
+            return self._rng.random(n)
+        if self._ri + n > RAND_BUFFER_SIZE:
+            self._rng.random(out=self._rbuf)
+            self._ri = 0
+        r = self._rbuf[self._ri:self._ri + n]
+        self._ri += n
+        return r
 
     def update_state(self) -> None:
         """
         Core flight logic: updates altitude, airspeed, distance, fuel, etc.
         Simulates extremely simplified flight physics for demonstration.
+        The arithmetic itself lives in the (Numba-compiled) _step kernel,
+        run here as a batch of one aircraft.
         """
-        # Convert from knots to ft/s
-        speed_fts = self.state.airspeed * 1.68781
-        # Calculate naive lift
-        lift = 0.5 * AIR_DENSITY * (speed_fts**2) * WING_AREA * LIFT_COEFFICIENT * 0.0689476
-        excess_lift = lift - self.state.total_weight
-
-        # RPM factor: if engine_rpm is high, produce more climb
-        rpm_factor = (self.state.engine_rpm - 2400) / 2400
+        self._advance(self.state._a[:, None])
 
-        # vertical_speed in ft/min
-        self.state.vertical_speed = (
-            excess_lift / self.state.total_weight * 1000
-            + rpm_factor * 500
-            - random.uniform(50, 100)
-        ) * self.weight_factor
-
-        # Update altitude in feet
-        self.state.altitude += self.state.vertical_speed / 60
-
-        # Wind effect on airspeed & heading
-        wind_effect = self.state.wind_speed * random.uniform(-0.1, 0.1)
-        self.state.airspeed += wind_effect
-        self.state.heading = (self.state.heading + wind_effect * 0.5) % 360
-
-        # Fuel consumption
-        # We'll assume a short step, so we approximate usage:
-        fuel_consumption = FUEL_BURN_RATE * 0.00833 * self.weight_factor
-        self.state.fuel -= fuel_consumption
-
-        # Distance covered (1 knot = 1.852 km/h)
-        speed_kmh = self.state.airspeed * 1.852
-        self.state.distance_remaining -= speed_kmh * 0.00833
+    def update_batch_state(self, batch: BatchedFlightState) -> None:
+        """
+        update_state for N aircraft sharing this instance's performance
+        figures, through the same _step kernel.
+        """
+        self._advance(batch._a)
 
-        # Possibly update random "ADS-B" style data
-        self.simulate_adsb_data()
-        self._constrain_parameters()
+    def _advance(self, s: np.ndarray) -> None:
+        """Run one _step on an (11, N) state array with fresh random draws."""
+        n = s.shape[1]
+        r = self._draws(STEP_DRAWS * n).reshape(STEP_DRAWS, n)
+        _step(s, r, self.weight_factor, self.max_climb_rate, self.stall_speed,
+              self.max_speed, self.max_fuel, self.max_altitude, self.max_rpm)
 
-    def _constrain_parameters(self) -> None:
+    def _build_rule_table(self) -> None:
+        """
+        Precompute the rule-based checks as open intervals (lo, hi): a rule
+        fires when lo < value < hi. Mutually exclusive follow-up rules
+        (e.g. "fuel low" after "fuel critical") get a lower bound that
+        excludes the first rule's range.
         """
-        Clamp or limit key parameters to within 'safe' or plausible bounds.
+        w = self.weights
+        inf = np.inf
+        just_below = lambda v: np.nextafter(v, -inf)  # so that lo < x <=> x >= v
+        high_vs = self.max_climb_rate * 0.7
+        # (state index in FlightState layout, lo, hi, priority, message)
+        rules = [
+            (ALT, -inf, self.min_safe_altitude, w["low_altitude"], "LOW ALT: Climb immediately!"),
+            (FUEL, -inf, 5, w["low_fuel"], "FUEL CRITICAL: Divert to nearest airport!"),
+            (FUEL, just_below(5), 10, w["low_fuel"] * 0.7, "Fuel low: Plan landing soon."),
+            (SPD, -inf, self.stall_speed + 10, w["speed_risk"], "NEAR STALL: Increase power!"),
+            (SPD, max(self.max_speed - 20, just_below(self.stall_speed + 10)), inf,
+             w["speed_risk"] * 0.8, "High speed: Reduce throttle!"),
+            (WX, 0.5, 1.5, w["weather"], "TURBULENCE: Maintain stable flight."),
+            (WX, 1.5, 2.5, w["weather"] * 1.2, "STORM: Consider changing route."),
+            (VS, high_vs, inf, w["stability"], "High VS: Adjust pitch or power."),
+            (VS, -inf, -high_vs, w["stability"], "High VS: Adjust pitch or power."),
+            (RPM, 2600, inf, w["engine"], "High RPM: Reduce throttle to avoid damage."),
+            (WEIGHT, self.max_gross_weight, inf, w["weight"],
+             "OVER MAX WEIGHT: Performance severely impacted."),
+            (CG, -inf, self.cg_limits[0], w["cg"], "CG OUT OF LIMITS: Unsafe load distribution!"),
+            (CG, self.cg_limits[1], inf, w["cg"], "CG OUT OF LIMITS: Unsafe load distribution!"),
+            (DIST, -inf, 50, w["distance"], "APPROACHING destination: Prepare landing."),
+        ]
+        self._rule_sel = np.array([r[0] for r in rules])
+        self._rule_lo = np.array([r[1] for r in rules], dtype=np.float64)
+        self._rule_hi = np.array([r[2] for r in rules], dtype=np.float64)
+        self._msg_table = [(r[3], r[4]) for r in rules]
+
+    def _rule_checks(self) -> List[Tuple[float, str]]:
+        """Rule-based recommendations, evaluated in one vectorized comparison."""
+        vals = self.state._a[self._rule_sel]
+        active = np.flatnonzero((vals > self._rule_lo) & (vals < self._rule_hi))
+        return [self._msg_table[i] for i in active]
+
+    def _predict(self) -> float:
         """
-        self.state.airspeed = max(self.stall_speed, min(self.max_speed, self.state.airspeed))
-        self.state.fuel = max(0, min(self.max_fuel, self.state.fuel))
-        self.state.altitude = max(0, min(self.max_altitude, self.state.altitude))
-        self.state.engine_rpm = max(1000, min(self.max_rpm, self.state.engine_rpm))
-        self.state.vertical_speed = max(-self.max_climb_rate, min(self.max_climb_rate, self.state.vertical_speed))
-        self.state.distance_remaining = max(0, self.state.distance_remaining)
+        Neural net criticality of the current state: 0 => safe, 1 => critical.
+        """
+        # Prepare features for MLP in the preallocated float32 buffer
+        features = self._feat
+        features[0, :] = self.state._a[:HDG]
+        if self._interpreter is not None:
+            return float(self._tflite_invoke(features))
+        return float(self._nn_forward(features))
 
     def evaluate_conditions(self) -> List[Tuple[float, str]]:
         """
         Generate recommendations from rule-based logic + neural net classification.
-        Returns a sorted list of (priority, message).
+        Returns the top 3 (priority, message) pairs, highest priority first.
         """
-        # Prepare features for MLP
-        features = np.array([[
-            self.state.altitude, self.state.airspeed, self.state.fuel,
-            self.state.vertical_speed, self.state.weather_severity,
-            self.state.engine_rpm, self.state.wind_speed,
-            self.state.total_weight, self.state.cg_position,
-            self.state.distance_remaining
-        ]])
-        # Prediction: 0 => safe, 1 => critical
-        criticality = self.model.predict(features, verbose=0)[0][0]
-
-        # Start collecting recommendations
-        recommendations = []
-        if criticality > 0.8:
-            recommendations.append((1.0, "CRITICAL: Immediate action required!"))
-
-        # Rule-based checks:
-        if self.state.altitude < self.min_safe_altitude:
-            recommendations.append((self.weights["low_altitude"], "LOW ALT: Climb immediately!"))
-        if self.state.fuel < 5:
-            recommendations.append((self.weights["low_fuel"], "FUEL CRITICAL: Divert to nearest airport!"))
-        elif self.state.fuel < 10:
-            recommendations.append((self.weights["low_fuel"] * 0.7, "Fuel low: Plan landing soon."))
-
-        if self.state.airspeed < self.stall_speed + 10:
-            recommendations.append((self.weights["speed_risk"], "NEAR STALL: Increase power!"))
-        elif self.state.airspeed > self.max_speed - 20:
-            recommendations.append((self.weights["speed_risk"] * 0.8, "High speed: Reduce throttle!"))
-
-        if self.state.weather_severity == 1:
-            recommendations.append((self.weights["weather"], "TURBULENCE: Maintain stable flight."))
-        elif self.state.weather_severity == 2:
-            recommendations.append((self.weights["weather"] * 1.2, "STORM: Consider changing route."))
-
-        if abs(self.state.vertical_speed) > (self.max_climb_rate * 0.7):
-            recommendations.append((self.weights["stability"], "High VS: Adjust pitch or power."))
-
-        if self.state.engine_rpm > 2600:
-            recommendations.append((self.weights["engine"], "High RPM: Reduce throttle to avoid damage."))
-
-        if self.state.total_weight > self.max_gross_weight:
-            recommendations.append((self.weights["weight"], "OVER MAX WEIGHT: Performance severely impacted."))
-
-        if not (self.cg_limits[0] <= self.state.cg_position <= self.cg_limits[1]):
-            recommendations.append((self.weights["cg"], "CG OUT OF LIMITS: Unsafe load distribution!"))
-
-        if self.state.distance_remaining < 50:
-            recommendations.append((self.weights["distance"], "APPROACHING destination: Prepare landing."))
-
-        # Sort by priority in descending order
-        return sorted(recommendations, key=lambda x: x[0], reverse=True)
+        recommendations = self._rule_checks()
+
+        # The neural net is the only source of the CRITICAL alert. The state
+        # changes slowly between ticks: refresh the prediction every
+        # NN_REFRESH_TICKS evaluations and reuse it in between
+        if self._nn_tick % NN_REFRESH_TICKS == 0:
+            self._cached_crit = self._predict()
+        self._nn_tick += 1
+        if self._cached_crit > 0.8:
+            recommendations.append(CRITICAL_ALERT)
+
+        # Top 3 by priority in descending order
+        return heapq.nlargest(3, recommendations, key=itemgetter(0))
+
+    def _refresh_status(self) -> None:
+        """Summarize the current flight status in the status panel."""
+        a = self.state._a
+        self._status_var.set(self._fmt(
+            a[ALT], a[SPD], a[FUEL], a[VS], a[RPM], a[WIND],
+            self._weather_names[int(a[WX])], a[WEIGHT], a[CG], a[DIST]
+        ))
 
     def update_gui(self):
         """
         Refresh the GUI labels (status + recommendations).
+        The status panel is refreshed every STATUS_REFRESH_TICKS calls;
+        recommendations are evaluated on every call.
         """
-        # Summarize flight status
-        status_text = (
-            f"ALT: {self.state.altitude:.0f} ft | SPD: {self.state.airspeed:.1f} kt\n"
-            f"FUEL: {self.state.fuel:.1f} gal | VS: {self.state.vertical_speed:.0f} fpm\n"
-            f"RPM: {self.state.engine_rpm:.0f} | WIND: {self.state.wind_speed:.1f} kt\n"
-            f"WEATHER: {['Clear','Turbulent','Storm'][self.state.weather_severity]}\n"
-            f"WEIGHT: {self.state.total_weight:.0f} lbs | CG: {self.state.cg_position:.1f} in\n"
-            f"REMAINING: {self.state.distance_remaining:.0f} km to Tokyo"
-        )
-        self.status_label.config(text=status_text)
+        if self._gui_tick % STATUS_REFRESH_TICKS == 0:
+            self._refresh_status()
+        self._gui_tick += 1
 
         # Evaluate conditions -> recommendations
         recs = self.evaluate_conditions()
         rec_text = "AI Recommendations:\n"
         if recs:
             # Display top 3 suggestions
-            for priority, msg in recs[:3]:
+            for priority, msg in recs:
                 rec_text += f"[{priority:.2f}] {msg}\n"
         else:
             rec_text += "Conditions nominal."
             self.stable_count += 1
 
-        self.recommend_label.config(text=rec_text)
+        self._recommend_var.set(rec_text)
+
+    def _tick(self) -> None:
+        """
+        One simulation step on the Tk main thread; reschedules itself
+        every TICK_INTERVAL_MS until a termination condition is met.
+        """
+        self.update_state()
+        self.update_gui()
+
+        # Termination checks
+        if self.state.fuel <= 0:
+            self._recommend_var.set("NO FUEL: Emergency landing required!")
+            self.running = False
+        elif self.state.distance_remaining <= 0:
+            self._recommend_var.set("ARRIVED AT DESTINATION: Prepare to land.")
+            self.running = False
+        elif self.stable_count >= 10:
+            self._recommend_var.set("STABLE FLIGHT ACHIEVED.")
+            self.running = False
+
+        if self.running:
+            self.root.after(TICK_INTERVAL_MS, self._tick)
+        else:
+            # The throttled panel may be a tick old; show the final state
+            self._refresh_status()
 
     def run_assistance(self):
         """
-        Start a background thread for flight updates and run the Tkinter mainloop.
+        Schedule flight updates on the Tk event loop and run the mainloop.
         """
-        def simulation_loop():
-            while self.running:
-                self.update_state()
-                self.update_gui()
-
-                # Termination checks
-                if self.state.fuel <= 0:
-                    self.recommend_label.config(text="NO FUEL: Emergency landing required!")
-                    self.running = False
-                elif self.state.distance_remaining <= 0:
-                    self.recommend_label.config(text="ARRIVED AT DESTINATION: Prepare to land.")
-                    self.running = False
-                elif self.stable_count >= 10:
-                    self.recommend_label.config(text="STABLE FLIGHT ACHIEVED.")
-                    self.running = False
-
-                time.sleep(0.5)
-
-        # Launch simulation in a separate thread to keep GUI responsive
-        threading.Thread(target=simulation_loop, daemon=True).start()
+        self.root.after(0, self._tick)
         self.root.mainloop()
 
 def main():